@@ -124,9 +124,10 @@ def get_iterator(x, ind=None):
         return map(lambda z: z[ind], x)
 
 
-def construct_collate_fn(feature_type, classifier_type='dense'):
+def construct_collate_fn(feature_type, classifier_type='dense',
+                         svm_labels=False):
     def _collate_fn_dense_full(batch):
-        return collate_fn_dense_full(batch)
+        return collate_fn_dense_full(batch, svm_labels)
 
     def _collate_fn_dense(batch):
         return collate_fn_dense(batch)
@@ -135,13 +136,13 @@ def construct_collate_fn(feature_type, classifier_type='dense'):
         return collate_fn_sparse(batch)
 
     def _collate_fn_dense_sl(batch):
-        return collate_fn_dense_sl(batch)
+        return collate_fn_dense_sl(batch, svm_labels)
 
     def _collate_fn_sparse_embedding(batch):
         return collate_fn_sparse_embedding(batch)
 
     def _collate_fn_sparse_sl(batch):
-        return collate_fn_sparse_sl(batch)
+        return collate_fn_sparse_sl(batch, svm_labels)
 
     if feature_type == 'dense':
         if classifier_type == 'None':
@@ -159,7 +160,15 @@ def construct_collate_fn(feature_type, classifier_type='dense'):
             return _collate_fn_sparse_embedding
 
 
-def collate_fn_sparse_sl(batch):
+def convert_labels_for_svm(y):
+    """
+    Convert 0/1 labels to -1/+1 as expected by hinge losses
+    * done once per batch in the loader instead of on every forward call
+    """
+    return 2.*y - 1.0
+
+
+def collate_fn_sparse_sl(batch, svm_labels=False):
     """
         Combine each sample in a batch with shortlist
         For sparse features
@@ -174,6 +183,8 @@ def collate_fn_sparse_sl(batch):
         get_iterator(z, 0), dtype=torch.LongTensor)
     batch_data['Y'] = collate_dense(
         get_iterator(z, 1), dtype=torch.FloatTensor)
+    if svm_labels:
+        batch_data['Y'] = convert_labels_for_svm(batch_data['Y'])
     batch_data['Y_sim'] = collate_dense(
         get_iterator(z, 2), dtype=torch.FloatTensor)
     batch_data['Y_mask'] = collate_dense(
@@ -181,7 +192,7 @@ def collate_fn_sparse_sl(batch):
     return batch_data
 
 
-def collate_fn_dense_sl(batch):
+def collate_fn_dense_sl(batch, svm_labels=False):
     """
         Combine each sample in a batch with shortlist
         For dense features
@@ -194,6 +205,8 @@ def collate_fn_dense_sl(batch):
         get_iterator(z, 0), dtype=torch.LongTensor)
     batch_data['Y'] = collate_dense(
         get_iterator(z, 1), dtype=torch.FloatTensor)
+    if svm_labels:
+        batch_data['Y'] = convert_labels_for_svm(batch_data['Y'])
     batch_data['Y_sim'] = collate_dense(
         get_iterator(z, 2), dtype=torch.FloatTensor)
     batch_data['Y_mask'] = collate_dense(
@@ -201,7 +214,7 @@ def collate_fn_dense_sl(batch):
     return batch_data
 
 
-def collate_fn_dense_full(batch):
+def collate_fn_dense_full(batch, svm_labels=False):
     """
         Combine each sample in a batch
         For dense features
@@ -209,6 +222,8 @@ def collate_fn_dense_full(batch):
     batch_data = {'batch_size': len(batch), 'X_ind': None}
     batch_data['X'] = collate_dense(get_iterator(batch, 0))
     batch_data['Y'] = collate_dense(get_iterator(batch, 1))
+    if svm_labels:
+        batch_data['Y'] = convert_labels_for_svm(batch_data['Y'])
     return batch_data
 
 
@@ -1,6 +1,7 @@
 import torch
 import torch.nn.functional as F
 import math
+from typing import Optional
 
 
 class _Loss(torch.nn.Module):
@@ -8,23 +9,21 @@ class _Loss(torch.nn.Module):
         super(_Loss, self).__init__()
         self.reduction = reduction
         self.pad_ind = pad_ind
+        self._padded_mask = None
+        if pad_ind is not None:
+            self.register_buffer(
+                '_pad_idx_tensor',
+                torch.tensor([pad_ind], dtype=torch.long))
 
     def _reduce(self, loss):
-        if self.reduction == 'none':
-            return loss
-        elif self.reduction == 'mean':
-            return loss.mean()
-        elif self.reduction == 'custom':
-            return loss.sum(dim=1).mean()
-        else:
-            return loss.sum()
+        return _reduce_loss(loss, self.reduction)
 
     def _mask_at_pad(self, loss):
         """
         Mask the loss at padding index, i.e., make it zero
         """
         if self.pad_ind is not None:
-            loss[:, self.pad_ind] = 0.0
+            loss.index_fill_(1, self._pad_idx_tensor, 0.0)
         return loss
 
     def _mask(self, loss, mask=None):
@@ -35,15 +34,78 @@ class _Loss(torch.nn.Module):
         * it'll make it zero where value is 0
         """
         if mask is not None:
-            loss = loss.masked_fill(~mask, 0.0)
+            # where() reads mask once; masked_fill(~mask, ...) pays an
+            # extra boolean-not kernel over the full tensor
+            loss = torch.where(mask, loss, torch.zeros_like(loss))
+        return loss
+
+    def _fold_pad_into_mask(self, loss, mask):
+        """
+        Combine padding index with the given mask (computed once per
+        output size/device); fused kernels then need a single mask
+        application rather than a separate assignment at pad_ind
+        """
+        if self.pad_ind is None:
+            return mask
+        if self._padded_mask is None \
+                or self._padded_mask.size(0) != loss.size(1) \
+                or self._padded_mask.device != loss.device:
+            _mask = torch.ones(
+                loss.size(1), dtype=torch.bool, device=loss.device)
+            _mask[self.pad_ind] = False
+            self._padded_mask = _mask
+        if mask is None:
+            return self._padded_mask.expand(loss.size(0), -1)
+        return mask & self._padded_mask
+
+
+@torch.jit.script
+def _reduce_loss(loss: torch.Tensor, reduction: str) -> torch.Tensor:
+    if reduction == 'none':
         return loss
+    # accumulate in fp32; a no-op for fp32 inputs and exact under
+    # half/bf16 autocast where a low-precision sum would drift
+    loss = loss.float()
+    if reduction == 'mean':
+        return loss.mean()
+    elif reduction == 'custom':
+        return loss.sum(dim=1).mean()
+    else:
+        return loss.sum()
 
 
-def _convert_labels_for_svm(y):
-    """
-        Convert labels from {0, 1} to {-1, 1}
+def compile_loss(criterion, **kwargs):
+    """Compile a loss module's forward with torch.compile (inductor)
+
+    * loss forwards here are elementwise chains plus a reduction —
+      inductor fuses them into a single kernel, including the
+      boundaries the scripted functions cannot cross
+    * no-op on torch versions without torch.compile
+
+    Arguments:
+    ----------
+    criterion: _Loss
+        loss module whose forward should be compiled
+    **kwargs:
+        passed to torch.compile, e.g., mode='reduce-overhead'
     """
-    return 2.*y - 1.0
+    if hasattr(torch, 'compile'):
+        criterion.forward = torch.compile(
+            criterion.forward, dynamic=True, **kwargs)
+    return criterion
+
+
+@torch.jit.script
+def _hinge_fwd(input: torch.Tensor, target: torch.Tensor, margin: float,
+               mask: Optional[torch.Tensor], reduction: str,
+               convert: bool) -> torch.Tensor:
+    # single elementwise pipeline; fused into one kernel by the JIT fuser
+    if convert:
+        target = 2.*target - 1.0
+    loss = F.relu(margin - target*input)
+    if mask is not None:
+        loss = torch.where(mask, loss, torch.zeros_like(loss))
+    return _reduce_loss(loss, reduction)
 
 
 class HingeLoss(_Loss):
@@ -61,11 +123,16 @@ class HingeLoss(_Loss):
     pad_ind: int/int64 or None (default=None)
         ignore loss values at this index
         useful when some index has to be used as padding index
+    convert_target: boolean, optional (default=True)
+        convert 0/1 targets to -1/+1 on the fly
+        * pass False when the loader already emits -1/+1 labels
     """
 
-    def __init__(self, margin=1.0, reduction='mean', pad_ind=None):
+    def __init__(self, margin=1.0, reduction='mean', pad_ind=None,
+                 convert_target=True):
         super(HingeLoss, self).__init__(reduction, pad_ind)
         self.margin = margin
+        self.convert_target = convert_target
 
     def forward(self, input, target, mask=None):
         """
@@ -85,10 +152,27 @@ class HingeLoss(_Loss):
         loss: torch.FloatTensor
             dimension is defined based on reduction
         """
-        loss = F.relu(self.margin - _convert_labels_for_svm(target)*input)
-        loss = self._mask_at_pad(loss)
-        loss = self._mask(loss, mask)
-        return self._reduce(loss)
+        return _hinge_fwd(input, target, self.margin,
+                          self._fold_pad_into_mask(input, mask),
+                          self.reduction, self.convert_target)
+
+
+@torch.jit.script
+def _sq_hinge_fwd(input: torch.Tensor, target: torch.Tensor, margin: float,
+                  mask: Optional[torch.Tensor], reduction: str,
+                  convert: bool) -> torch.Tensor:
+    # sub/mul/relu/square fuse into one kernel; eager would materialize
+    # the post-relu tensor separately from its square
+    if convert:
+        target = 2.*target - 1.0
+    # margin - target*input is a fresh temporary, so the in-place relu
+    # adds no allocation; the square stays out-of-place as relu's
+    # backward reads its result
+    loss = (margin - target*input).relu_()
+    loss = loss*loss
+    if mask is not None:
+        loss = torch.where(mask, loss, torch.zeros_like(loss))
+    return _reduce_loss(loss, reduction)
 
 
 class SquaredHingeLoss(_Loss):
@@ -106,11 +190,16 @@ class SquaredHingeLoss(_Loss):
     pad_ind: int/int64 or None (default=None)
         ignore loss values at this index
         useful when some index has to be used as padding index
+    convert_target: boolean, optional (default=True)
+        convert 0/1 targets to -1/+1 on the fly
+        * pass False when the loader already emits -1/+1 labels
     """
 
-    def __init__(self, margin=1.0, size_average=None, reduction='mean'):
-        super(SquaredHingeLoss, self).__init__(size_average, reduction)
+    def __init__(self, margin=1.0, reduction='mean', pad_ind=None,
+                 convert_target=True):
+        super(SquaredHingeLoss, self).__init__(reduction, pad_ind)
         self.margin = margin
+        self.convert_target = convert_target
 
     def forward(self, input, target, mask=None):
         """
@@ -130,11 +219,24 @@ class SquaredHingeLoss(_Loss):
         loss: torch.FloatTensor
             dimension is defined based on reduction
         """
-        loss = F.relu(self.margin - _convert_labels_for_svm(target)*input)
-        loss = loss**2
-        loss = self._mask_at_pad(loss)
-        loss = self._mask(loss, mask)
-        return self._reduce(loss)
+        return _sq_hinge_fwd(input, target, self.margin,
+                             self._fold_pad_into_mask(input, mask),
+                             self.reduction, self.convert_target)
+
+
+@torch.jit.script
+def _bce_fwd(input: torch.Tensor, target: torch.Tensor,
+             weight: Optional[torch.Tensor],
+             pos_weight: Optional[torch.Tensor],
+             mask: Optional[torch.Tensor],
+             reduction: str) -> torch.Tensor:
+    # aten's BCE-with-logits kernel is already fused and log-sum-exp
+    # safe; scripting folds the mask and reduction into the same graph
+    loss = F.binary_cross_entropy_with_logits(
+        input, target, weight, pos_weight=pos_weight, reduction='none')
+    if mask is not None:
+        loss = torch.where(mask, loss, torch.zeros_like(loss))
+    return _reduce_loss(loss, reduction)
 
 
 class BCEWithLogitsLoss(_Loss):
@@ -185,13 +287,22 @@ class BCEWithLogitsLoss(_Loss):
         loss: torch.FloatTensor
             dimension is defined based on reduction
         """
-        loss = F.binary_cross_entropy_with_logits(input, target,
-                                                  self.weight,
-                                                  pos_weight=self.pos_weight,
-                                                  reduction='none')
-        loss = self._mask_at_pad(loss)
-        loss = self._mask(loss, mask)
-        return self._reduce(loss)
+        return _bce_fwd(input, target, self.weight, self.pos_weight,
+                        self._fold_pad_into_mask(input, mask),
+                        self.reduction)
+
+
+@torch.jit.script
+def _hinge_contrastive_fwd(input: torch.Tensor, target: torch.Tensor,
+                           margin: float, pos_weight: float,
+                           mask: Optional[torch.Tensor],
+                           reduction: str) -> torch.Tensor:
+    # relu(input - margin) == max(0, input - margin); no zeros_like needed
+    loss = torch.where(target > 0, (1.0 - input)*pos_weight,
+                       F.relu(input - margin))
+    if mask is not None:
+        loss = torch.where(mask, loss, torch.zeros_like(loss))
+    return _reduce_loss(loss, reduction)
 
 
 class HingeContrastiveLoss(_Loss):
@@ -231,12 +342,21 @@ class HingeContrastiveLoss(_Loss):
         loss: torch.FloatTensor
             dimension is defined based on reduction
         """
-        loss = torch.where(target > 0, (1-input) * self.pos_weight,
-                           torch.max(
-                               torch.zeros_like(input), input - self.margin))
-        loss = self._mask_at_pad(loss)
-        loss = self._mask(loss, mask)
-        return self._reduce(loss)
+        return _hinge_contrastive_fwd(input, target, self.margin,
+                                      self.pos_weight,
+                                      self._fold_pad_into_mask(input, mask),
+                                      self.reduction)
+
+
+@torch.jit.script
+def _triplet_ohnm_fwd(sim_p: torch.Tensor, sim_n: torch.Tensor,
+                      margin: float, apply_softmax: bool,
+                      reduction: str) -> torch.Tensor:
+    loss = F.relu(sim_n - sim_p + margin)
+    if apply_softmax:
+        prob = torch.softmax(sim_n*(loss > 0).to(sim_n.dtype), dim=1)
+        loss = loss*prob
+    return _reduce_loss(loss, reduction)
 
 
 class TripletMarginLossOHNM(_Loss):
@@ -283,17 +403,121 @@ class TripletMarginLossOHNM(_Loss):
             dimension is defined based on reduction
         """
         sim_p = torch.diagonal(input).view(-1, 1)
-        similarities = torch.min(input, 1-target)
-        _, indices = torch.topk(similarities, largest=True, dim=1, k=self.k)
+        # mining is non-differentiable; detach so the masked copy is
+        # not tracked by autograd (in-place fill would corrupt input,
+        # which callers reuse after the loss)
+        similarities = input.detach().masked_fill(target > 0, -float('inf'))
+        if self.k == 1:
+            # argmax is a single-pass reduction; topk(k=1) is sort-based
+            indices = similarities.argmax(dim=1, keepdim=True)
+        else:
+            _, indices = torch.topk(
+                similarities, largest=True, dim=1, k=self.k)
         sim_n = input.gather(1, indices)
-        loss = torch.max(torch.zeros_like(sim_p), sim_n - sim_p + self.margin)
-        mask = torch.where(loss != 0, torch.ones_like(loss), torch.zeros_like(loss))
-        if self.apply_softmax:
-            prob = torch.softmax(sim_n * mask, dim=1)
-            loss = loss * prob
-        loss = self._mask_at_pad(loss)
-        loss = self._mask(loss, mask)
-        return self._reduce(loss)
+        return _triplet_ohnm_fwd(sim_p, sim_n, self.margin,
+                                 self.apply_softmax, self.reduction)
+
+
+class _FusedLinearHinge(torch.autograd.Function):
+    """Hinge loss fused with the classifier gemm
+    * computes logits tile-by-tile over labels and reduces each tile
+      immediately; the batch_size x output_size logits matrix is never
+      written to memory
+    * backward recomputes tile logits instead of storing them
+    """
+
+    @staticmethod
+    def forward(ctx, hidden, weight, target, mask, margin, chunk_size):
+        # fp32 accumulator regardless of compute dtype
+        total = hidden.new_zeros((), dtype=torch.float32)
+        for start in range(0, weight.size(0), chunk_size):
+            end = start + chunk_size
+            logits = hidden @ weight[start:end].T
+            loss = F.relu(
+                margin - (2.*target[:, start:end] - 1.0)*logits)
+            if mask is not None:
+                loss = loss*mask[:, start:end]
+            total += loss.sum(dtype=torch.float32)
+        ctx.save_for_backward(hidden, weight, target, mask)
+        ctx.margin = margin
+        ctx.chunk_size = chunk_size
+        return total
+
+    @staticmethod
+    def backward(ctx, grad_out):
+        hidden, weight, target, mask = ctx.saved_tensors
+        grad_h = torch.zeros_like(hidden)
+        grad_w = torch.zeros_like(weight)
+        for start in range(0, weight.size(0), ctx.chunk_size):
+            end = start + ctx.chunk_size
+            w = weight[start:end]
+            logits = hidden @ w.T
+            y = 2.*target[:, start:end] - 1.0
+            g = (ctx.margin - y*logits > 0).to(hidden.dtype)*(-y)
+            if mask is not None:
+                g = g*mask[:, start:end]
+            g = g*grad_out
+            grad_h += g @ w
+            grad_w[start:end] = g.T @ hidden
+        return grad_h, grad_w, None, None, None, None
+
+
+class FusedLinearHingeLoss(_Loss):
+    r""" Hinge loss fused with the label classifier
+
+    * takes document embeddings and the classifier/label weight matrix
+      instead of pre-computed logits; the full logits tensor — the
+      largest activation at XML scale — is never materialized
+    * supports 'mean', 'sum' and 'custom' reductions; 'none' would
+      require the full loss matrix and is not supported
+
+    Arguments:
+    ----------
+    margin: float, optional (default=1.0)
+        the margin in hinge loss
+    reduction: string, optional (default='mean')
+        Specifies the reduction to apply to the output:
+        * 'mean', 'sum' or 'custom'
+    chunk_size: int, optional (default=32768)
+        #labels per tile; trades peak memory for gemm efficiency
+    """
+
+    def __init__(self, margin=1.0, reduction='mean', chunk_size=32768):
+        super(FusedLinearHingeLoss, self).__init__(reduction=reduction)
+        if reduction == 'none':
+            raise NotImplementedError(
+                "'none' reduction requires the full loss matrix.")
+        self.margin = margin
+        self.chunk_size = chunk_size
+
+    def forward(self, hidden, weight, target, mask=None):
+        """
+        Arguments:
+        ---------
+        hidden: torch.FloatTensor
+            document embeddings of size: batch_size x repr_dims
+        weight: torch.FloatTensor
+            classifier weights of size: output_size x repr_dims
+        target:  torch.FloatTensor
+            0/1 ground truth matrix of size: batch_size x output_size
+        mask: torch.FloatTensor or None, optional (default=None)
+            ignore entries [won't contribute to loss] where mask value
+            is zero
+
+        Returns:
+        -------
+        loss: torch.FloatTensor
+            reduced scalar loss
+        """
+        if mask is not None:
+            mask = mask.to(hidden.dtype)
+        loss = _FusedLinearHinge.apply(
+            hidden, weight, target, mask, self.margin, self.chunk_size)
+        if self.reduction == 'mean':
+            return loss/target.numel()
+        elif self.reduction == 'custom':
+            return loss/target.size(0)
+        return loss
 
 
 class ProbContrastiveLoss(_Loss):
@@ -346,6 +346,10 @@ class Parameters(ParametersBase):
             type=str,
             action='store',
             help='cosine/dot')
+        self.parser.add_argument(
+            '--compile_loss',
+            action='store_true',
+            help='Compile the loss with torch.compile (inductor)')
         self.parser.add_argument(
             '--keep_invalid',
             action='store_true',
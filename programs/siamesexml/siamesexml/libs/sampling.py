@@ -4,6 +4,33 @@ from functools import partial
 import warnings
 
 
+# shared unit weight; treated as read-only by consumers
+_ONE_F32 = np.ones(1, dtype=np.float32)
+
+
+def _build_alias_table(prob):
+    """Build Walker alias tables for weighted sampling
+    * O(N) construction; each draw is then O(1) instead of a
+      binary search over the cumulative distribution
+    Returns (q, J): acceptance probabilities and alias indices
+    """
+    n = len(prob)
+    q = np.asarray(prob, dtype=np.float64)*n
+    J = np.arange(n, dtype=np.int64)
+    smaller = np.nonzero(q < 1.0)[0].tolist()
+    larger = np.nonzero(q >= 1.0)[0].tolist()
+    while smaller and larger:
+        small = smaller.pop()
+        large = larger.pop()
+        J[small] = large
+        q[large] = (q[large] + q[small]) - 1.0
+        if q[large] < 1.0:
+            smaller.append(large)
+        else:
+            larger.append(large)
+    return q.astype(np.float32), J
+
+
 class BaseSampler(object):
     """Sampler with support for sampling from
         multinomial distribution
@@ -23,40 +50,67 @@ class BaseSampler(object):
         self.num_samples = num_samples
         self.prob = prob
         self.replace = replace
+        self._rng = np.random.default_rng()
+        self._ones = np.ones(num_samples, dtype=np.float32)
         self.index = None
         self._construct()
 
     def _construct(self):
         """Create a partial function with given parameters
         Index should take one argument i.e. size during querying
+        * Generator.integers (PCG64) is faster than the legacy
+          np.random.randint and holds no global lock
         """
-        self.index = partial(np.random.randint, low=0, high=self.size)
+        self.index = partial(self._rng.integers, low=0, high=self.size)
+
+    def __getstate__(self):
+        # Generator state is process-local; drop it along with the
+        # partial that binds it and recreate both on load
+        state = self.__dict__.copy()
+        state.pop('_rng', None)
+        state.pop('index', None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._rng = np.random.default_rng()
+        self._construct()
 
     def _query(self):
         """Query for one sample
         """
-        return (self.index(size=self.num_samples), [1.0]*self.num_samples)
+        return (self.index(size=self.num_samples), self._ones)
 
     def query(self, num_instances, *args, **kwargs):
         """Query shortlist for one or more samples
+        * a single batched draw when sampling with replacement
         """
         if num_instances == 1:
             return self._query()
+        elif not self.replace:
+            # without replacement is per-instance by definition
+            return [self._query() for _ in range(num_instances)]
         else:
-            out = [self._query() for _ in range(num_instances)]
-            return out
+            indices = self.index(
+                size=(num_instances, self.num_samples))
+            weights = np.broadcast_to(
+                self._ones, (num_instances, self.num_samples))
+            return list(zip(indices, weights))
 
     def save(self, fname):
         """
             Save object
+        * protocol 5 serializes array buffers out-of-band, i.e.,
+          without an extra in-memory copy of prob-sized arrays
         """
-        state = self.__dict__
-        pickle.dump(state, open(fname, 'wb'))
+        with open(fname, 'wb') as fp:
+            pickle.dump(self.__getstate__(), fp, protocol=5)
 
     def load(self, fname):
         """ Load object
         """
-        self = pickle.load(open(fname, 'rb'))
+        with open(fname, 'rb') as fp:
+            self.__setstate__(pickle.load(fp))
 
     @property
     def data_init(self):
@@ -81,9 +135,26 @@ class NegativeSampler(BaseSampler):
         super().__init__(num_labels, num_negatives, prob, replace)
 
     def _construct(self):
-        self.index = partial(
-            np.random.default_rng().choice, a=self.size,
-            replace=self.replace, p=self.prob)
+        if self.prob is not None and self.replace:
+            # alias tables: O(1) per draw vs. O(log N) for choice(p=...)
+            self._q, self._J = _build_alias_table(self.prob)
+            self.index = self._alias_draw
+        else:
+            self.index = partial(
+                self._rng.choice, a=self.size,
+                replace=self.replace, p=self.prob)
+
+    def _alias_draw(self, size):
+        k = self._rng.integers(0, self.size, size=size)
+        r = self._rng.random(size=k.shape)
+        return np.where(r < self._q[k], k, self._J[k])
+
+    def __getstate__(self):
+        # alias tables are derived from prob; rebuilt by _construct
+        state = super().__getstate__()
+        state.pop('_q', None)
+        state.pop('_J', None)
+        return state
 
 
 class Sampler(BaseSampler):
@@ -106,7 +177,7 @@ class Sampler(BaseSampler):
 
     def _construct(self):
         self.index = partial(
-            np.random.default_rng().choice,
+            self._rng.choice,
             replace=self.replace)
 
     def _query(self, ind):
@@ -115,14 +186,32 @@ class Sampler(BaseSampler):
         prob = None
         if self.prob is not None:
             prob = self.prob[ind]
-        return (self.index(a=ind, p=prob), [1.0])
+        return (self.index(a=ind, p=prob), _ONE_F32)
 
     def query(self, num_instances, ind, *args, **kwargs):
         """Query shortlist for one or more samples;
         Pick labels from given indices
+        * one segmented draw over all instances; no per-instance
+          Python-level RNG dispatch
         """
         if num_instances == 1:
             return self._query(ind)
+        lengths = np.fromiter(
+            map(len, ind), dtype=np.int64, count=num_instances)
+        offsets = np.zeros(num_instances, dtype=np.int64)
+        np.cumsum(lengths[:-1], out=offsets[1:])
+        flat = np.concatenate(ind)
+        u = self._rng.random(num_instances)
+        if self.prob is None:
+            picked = flat[offsets + (u*lengths).astype(np.int64)]
         else:
-            out = [self._query(ind[i]) for i in range(num_instances)]
-            return out
+            # per-segment inverse-CDF on the running cumulative sum
+            w = self.prob[flat]
+            cw = np.cumsum(w)
+            starts = cw[offsets] - w[offsets]
+            totals = np.add.reduceat(w, offsets)
+            keys = starts + u*totals
+            picked = flat[np.clip(
+                np.searchsorted(cw, keys, side='right'),
+                offsets, offsets + lengths - 1)]
+        return [(picked[i], _ONE_F32) for i in range(num_instances)]
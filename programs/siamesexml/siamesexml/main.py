@@ -424,6 +424,8 @@ def main(params):
         else:  # trust the random init
             print("Random initialization.")
         criterion = construct_loss(params)
+        if getattr(params, 'compile_loss', False):
+            criterion = loss.compile_loss(criterion)
         print("Model parameters: ", params)
         print("\nModel configuration: ", net)
         opt = optimizer.Optimizer(
@@ -544,7 +544,12 @@ class SiameseXML(DeepXMLBase):
         cnt_rep = self.encode_document(batch_data['CX'], batch_data['CX_ind'])
         # compute the centroid with 2 positive documents
         cnt_rep = F.normalize(cnt_rep + lbl_rep)
-        return self.similarity(doc_rep, lbl_rep), self.similarity(cnt_rep, lbl_rep)
+        if self.metric == 'cosine':
+            # normalize each representation once; both similarities
+            # then reduce to plain dot products (cnt_rep is unit-norm)
+            doc_rep = F.normalize(doc_rep, dim=1)
+            lbl_rep = F.normalize(lbl_rep, dim=1)
+        return doc_rep @ lbl_rep.T, cnt_rep @ lbl_rep.T
 
     def to(self):
         """Send layers to respective devices